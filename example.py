@@ -37,7 +37,11 @@ def bot_startup(startup_state: StateSnapshot):
 
 # Can handle some resource initialization for each worker, like LLMs or database connections
 class MyDB:
-    def execute(self, query: str):
+    # NOTE: Use `__slots__` for per-worker resource classes to reduce memory and speed up
+    #       attribute access
+    __slots__ = ()
+
+    def execute(self, query: str, params: tuple = ()):
         pass  # Handle query somehow...
 
 
@@ -60,7 +64,16 @@ def worker_startup(worker_state: TaskiqState):  # NOTE: You need the type hint t
 # NOTE: The type hint for block is `BlockAPI`, but we parse it using `EcosystemAPI`
 # NOTE: If you need something from worker state, you have to use taskiq context
 def exec_block(block: BlockAPI, context: Annotated[Context, TaskiqDepends()]):
-    context.state.db.execute(f"some query {block.number}")
+    # NOTE: Pass values as query parameters instead of formatting them into the query string,
+    #       so the DB driver can re-use the prepared statement for every block
+    context.state.db.execute("some query %s", (block.number,))
+
+    # NOTE: You can have multiple handlers for any trigger we support, but each one is dispatched
+    #       as a separate task, so combine them when you want to reduce per-block overhead
+    if bot.state.logs_processed > 20:
+        # If you ever want the bot to immediately shutdown under some scenario, raise this exception
+        raise CircuitBreaker("Oopsie!")
+
     return len(block.transactions)
 
 
@@ -75,7 +88,7 @@ def exec_event1(log):
         raise ValueError("I don't like the number 3.")
 
     # You can update state whenever you want
-    bot.state.logs_processed += 1
+    bot.state.increment("logs_processed")
 
     return {"amount": log.amount}
 
@@ -84,20 +97,13 @@ def exec_event1(log):
 # Any handler function can be async too
 async def exec_event2(log: ContractLog):
     # All `bot.state` values are updated across all workers at the same time
-    bot.state.logs_processed += 1
+    bot.state.increment("logs_processed")
+
     # Do any other long running tasks...
     await asyncio.sleep(5)
     return log.amount
 
 
-@bot.on_(chain.blocks)
-# NOTE: You can have multiple handlers for any trigger we support
-def check_logs(log):
-    if bot.state.logs_processed > 20:
-        # If you ever want the bot to immediately shutdown under some scenario, raise this exception
-        raise CircuitBreaker("Oopsie!")
-
-
 # A final job to execute on Silverback shutdown
 @bot.on_shutdown()
 def bot_shutdown():
@@ -1,28 +1,38 @@
-def __getattr__(name: str):
-    if name == "CircuitBreaker":
-        from .exceptions import CircuitBreaker
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-        return CircuitBreaker
+if TYPE_CHECKING:
+    from .exceptions import CircuitBreaker, SilverbackException
+    from .main import SilverbackBot
+    from .state import StateSnapshot
 
-    elif name == "SilverbackException":
-        from .exceptions import SilverbackException
+# NOTE: Map of public name to the submodule that defines it, imported on first access so that
+#       `import silverback` (e.g. for the CLI) does not load `ape`, `taskiq`, etc.
+_LAZY_IMPORTS = {
+    "CircuitBreaker": ".exceptions",
+    "SilverbackException": ".exceptions",
+    "SilverbackBot": ".main",
+    "StateSnapshot": ".state",
+}
 
-        return SilverbackException
 
-    elif name == "SilverbackBot":
-        from .main import SilverbackBot
+def __getattr__(name: str):
+    if not (module_name := _LAZY_IMPORTS.get(name)):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        return SilverbackBot
+    obj = getattr(import_module(module_name, __name__), name)
+    # NOTE: Cache so that `__getattr__` is only called once per name
+    globals()[name] = obj
+    return obj
 
-    elif name == "StateSnapshot":
-        from .state import StateSnapshot
 
-        return StateSnapshot
+def __dir__() -> list[str]:
+    return list(__all__)
 
 
-__all__ = [
+__all__ = (
     "StateSnapshot",
     "CircuitBreaker",
     "SilverbackBot",
     "SilverbackException",
-]
+)
@@ -1,57 +1,37 @@
-import shlex
+import os
+import stat
 import subprocess
-from functools import singledispatchmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Final
 
 import click
-from ape.utils.os import clean_path
 
-DOCKERFILE_CONTENT = """
-FROM ghcr.io/apeworx/silverback:stable
-USER root
-WORKDIR /app
-RUN chown harambe:harambe /app
-USER harambe
-"""
+DOCKERFILE_CONTENT: Final = (
+    "# syntax=docker/dockerfile:1\n"
+    "FROM ghcr.io/apeworx/silverback:stable\n"
+    "USER root\n"
+    "WORKDIR /app\n"
+    "RUN chown harambe:harambe /app\n"
+    "USER harambe\n"
+)
 
 
-# Note: Python3.12 supports subclassing pathlib.Path
-class BasePath(Path):
-    _flavour = type(Path())._flavour  # type: ignore
-
-
-class FilePath(BasePath):
-    """A subclass of Path representing a file."""
-
-
-class DirPath(BasePath):
-    """A subclass of Path representing a path"""
-
-
-def get_path(path: Path):
-    if path.is_file():
-        return FilePath(str(path))
-    elif path.is_dir():
-        return DirPath(str(path))
-    else:
-        raise ValueError(f"{path} is neither a file nor a directory")
-
-
-PathType = Union["FilePath", "DirPath"]
-
-
-def generate_dockerfiles(path: Path):
-    path = get_path(path)
+def generate_dockerfiles(path: Path) -> list[Path]:
     dg = DockerfileGenerator()
-    dg.generate_dockerfiles(path)
+    return dg.generate_dockerfiles(path)
 
 
-def build_docker_images(path: Path):
-    DockerfileGenerator.build_images(path)
+def build_docker_images(path: Path, dockerfiles: list[Path] | None = None):
+    DockerfileGenerator.build_images(path, dockerfiles=dockerfiles)
 
 
 class DockerfileGenerator:
+    def __init__(self):
+        self.cwd = Path.cwd()
+        # NOTE: Scan project root once, instead of checking each file for every Dockerfile
+        with os.scandir(self.cwd) as entries:
+            self.project_files = {entry.name for entry in entries if entry.is_file()}
 
     @property
     def dockerfile_name(self):
@@ -61,84 +41,148 @@ class DockerfileGenerator:
     def dockerfile_name(self, name):
         self._dockerfile_name = name
 
-    @singledispatchmethod
-    def generate_dockerfiles(self, path: PathType):
+    def generate_dockerfiles(self, path: Path) -> list[Path]:
         """
-        Will generate a file based on path type
+        Will generate a file based on path type, and return the paths of the Dockerfiles
         """
-        raise NotImplementedError(f"Path type {type(path)} not supported")
-
-    @generate_dockerfiles.register
-    def _(self, path: FilePath):
-        dockerfile_content = self._check_for_requirements(DOCKERFILE_CONTENT)
-        self.dockerfile_name = f"Dockerfile.{path.parent.name}-bot"
-        dockerfile_content += f"COPY {path.name}/ /app/bot.py\n"
-        self._build_helper(dockerfile_content)
-
-    @generate_dockerfiles.register
-    def _(self, path: DirPath):
-        bots = self._get_all_bot_files(path)
-        for bot in bots:
+        # NOTE: One `stat` call to determine the path type
+        try:
+            path_mode = path.stat().st_mode
+        except FileNotFoundError:
+            path_mode = 0
+
+        if stat.S_ISREG(path_mode):
             dockerfile_content = self._check_for_requirements(DOCKERFILE_CONTENT)
+            self.dockerfile_name = f"Dockerfile.{path.parent.name}-bot"
+            dockerfile_content += f"COPY {path.name}/ /app/bot.py\n"
+            return [self._build_helper(dockerfile_content)]
+
+        elif not stat.S_ISDIR(path_mode):
+            raise ValueError(f"{path} is neither a file nor a directory")
+
+        if not (bots := self._get_all_bot_files(path)):
+            click.echo(f"No bots found in '{path.name}/', nothing to generate")
+            return []
+
+        # NOTE: Same for every bot in the project
+        base_dockerfile_content = self._check_for_requirements(DOCKERFILE_CONTENT)
+        dockerfiles = []
+        for bot in bots:
+            dockerfile_content = base_dockerfile_content
             if bot.name == "__init__.py" or bot.name == "bot.py":
                 self.dockerfile_name = f"Dockerfile.{bot.parent.parent.name}-bot"
                 dockerfile_content += f"COPY {path.name}/ /app/bot\n"
             else:
                 self.dockerfile_name = f"Dockerfile.{bot.name.replace('.py', '')}"
                 dockerfile_content += f"COPY {path.name}/{bot.name} /app/bot.py\n"
-            self._build_helper(dockerfile_content)
+            dockerfiles.append(self._build_helper(dockerfile_content))
+
+        return dockerfiles
 
-    def _build_helper(self, dockerfile_c: str):
+    def _build_helper(self, dockerfile_c: str) -> Path:
         """
         Used in multiple places in build.
         """
-        dockerfile_path = Path.cwd() / ".silverback-images" / self.dockerfile_name
+        from ape.utils.os import clean_path
+
+        dockerfile_path = self.cwd / ".silverback-images" / self.dockerfile_name
+        # NOTE: Compile bot source into the image so it is not re-compiled on every container start.
+        #       Must run as root, since `COPY` creates bot directories owned by root.
+        dockerfile_content = (
+            dockerfile_c + "USER root\nRUN python -m compileall -q /app\nUSER harambe\n"
+        )
+        # NOTE: Do not re-write unchanged files, so their mtime is kept for the build cache
+        if dockerfile_path.exists() and dockerfile_path.read_text() == dockerfile_content:
+            click.echo(f"Unchanged {clean_path(dockerfile_path)}")
+            return dockerfile_path
+
         dockerfile_path.parent.mkdir(exist_ok=True)
-        dockerfile_path.write_text(dockerfile_c.strip() + "\n")
+        dockerfile_path.write_text(dockerfile_content)
         click.echo(f"Generated {clean_path(dockerfile_path)}")
+        return dockerfile_path
 
     def _check_for_requirements(self, dockerfile_content):
-        if (Path.cwd() / "requirements.txt").exists():
+        if "requirements.txt" in self.project_files:
+            dockerfile_content += "COPY --from=ghcr.io/astral-sh/uv:latest /uv /bin/\n"
             dockerfile_content += "COPY requirements.txt .\n"
+            dockerfile_content += "USER root\n"
             dockerfile_content += (
-                "RUN pip install --upgrade pip && pip install -r requirements.txt\n"
+                "RUN --mount=type=cache,target=/root/.cache/uv "
+                "uv pip install --system -r requirements.txt\n"
             )
+            dockerfile_content += "USER harambe\n"
 
-        if (Path.cwd() / "ape-config.yaml").exists():
+        if "ape-config.yaml" in self.project_files:
             dockerfile_content += "COPY ape-config.yaml .\n"
             dockerfile_content += "RUN ape plugins install -U .\n"
 
         return dockerfile_content
 
-    def _get_all_bot_files(self, path: DirPath):
-        files = sorted({file for file in path.iterdir() if file.is_file()}, reverse=True)
-        bots = []
-        for file in files:
-            if file.name == "__init__.py" or file.name == "bot.py":
-                bots = [file]
-                break
-            bots.append(file)
-        return bots
+    def _get_all_bot_files(self, path: Path):
+        with os.scandir(path) as entries:
+            files = {entry.name: entry.path for entry in entries if entry.is_file()}
+
+        # NOTE: A `bot.py` or `__init__.py` means the directory *is* the bot
+        for name in ("bot.py", "__init__.py"):
+            if name in files:
+                return [Path(files[name])]
+
+        return [Path(files[name]) for name in sorted(files, reverse=True)]
+
+    @staticmethod
+    def _build_image(file: Path):
+        tag = f"{file.name.split('.')[1]}:latest"
+        command = [
+            "docker",
+            "build",
+            "-f",
+            f"./{file.parent.name}/{file.name}",
+            "-t",
+            tag,
+            # NOTE: Re-use layers from the last build of this image, and embed cache metadata
+            #       so this image can also be used as a cache source after it is pushed
+            "--cache-from",
+            tag,
+            "--build-arg",
+            "BUILDKIT_INLINE_CACHE=1",
+            ".",
+        ]
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
+            # NOTE: BuildKit is needed for the cache mounts in our generated Dockerfiles
+            env={**os.environ, "DOCKER_BUILDKIT": "1"},
+        ) as process:
+            assert process.stdout  # mypy happy
+            # NOTE: Stream output as it comes, prefixed since multiple builds can run at once
+            for line in process.stdout:
+                click.echo(f"[{tag}] {line}", nl=False)
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
 
     @staticmethod
-    def build_images(path: Path):
-        dockerfiles = {file for file in path.iterdir() if file.is_file()}
-        for file in dockerfiles:
-            try:
-                command = shlex.split(
-                    "docker build -f "
-                    f"./{file.parent.name}/{file.name} "
-                    f"-t {file.name.split('.')[1]}:latest ."
-                )
-                result = subprocess.run(
-                    command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    check=True,
-                )
-                click.echo(result.stdout)
-            except subprocess.CalledProcessError as e:
-                click.echo("Error during docker build:")
-                click.echo(e.stderr)
-                raise
+    def build_images(path: Path, dockerfiles: list[Path] | None = None):
+        # NOTE: Only scan `path` if we don't already know which Dockerfiles to build
+        if dockerfiles is None:
+            dockerfiles = [file for file in path.iterdir() if file.is_file()]
+
+        if not dockerfiles:
+            return
+
+        # NOTE: Builds are independent and mostly wait on docker, so run them concurrently
+        with ThreadPoolExecutor(max_workers=min(len(dockerfiles), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(DockerfileGenerator._build_image, file) for file in dockerfiles]
+            for future in futures:
+                try:
+                    future.result()
+                except subprocess.CalledProcessError as e:
+                    for pending in futures:
+                        pending.cancel()
+
+                    raise click.ClickException(
+                        f"Error during docker build: `{' '.join(e.cmd)}`"
+                    ) from e
@@ -1,29 +1,32 @@
 from datetime import datetime, timedelta
-from functools import update_wrapper
+from functools import cache, update_wrapper
+from importlib import import_module
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import click
-from fief_client import Fief
-from fief_client.integrations.cli import FiefAuth, FiefAuthNotAuthenticatedError
-
-from silverback.cluster.settings import (
-    PROFILE_PATH,
-    BaseProfile,
-    ClusterProfile,
-    PlatformProfile,
-    ProfileSettings,
-)
-from silverback.exceptions import ImportFromStringError
 
 if TYPE_CHECKING:
     from ape.contracts import ContractInstance
+    from fief_client.integrations.cli import FiefAuth
 
     from silverback.cluster.client import PlatformClient
+    from silverback.cluster.settings import BaseProfile, ProfileSettings
 
 
-# NOTE: only load once
-settings = ProfileSettings.from_config_file()
+# NOTE: only load once, and only when a command needs it (not just for `--help`)
+@cache
+def get_settings() -> "ProfileSettings":
+    from silverback.cluster.settings import ProfileSettings
+
+    return ProfileSettings.from_config_file()
+
+
+def dump_yaml(data) -> str:
+    import yaml  # type: ignore[import-untyped]
+
+    # NOTE: Use the libyaml C emitter when PyYAML was built with it (same output as `safe_dump`)
+    return yaml.dump(data, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
 
 
 def cls_import_callback(ctx, param, cls_name):
@@ -118,6 +121,8 @@ class SectionedHelpGroup(OrderedCommands):
     def __init__(self, *args, section=None, **kwargs):
         self.section = section or "Commands"
         self.sections = kwargs.pop("sections", {})
+        # NOTE: Map of command name to "module:attr", only imported once the command is needed
+        self.lazy_commands: dict[str, str] = kwargs.pop("lazy_commands", {})
         commands = {}
 
         for section, command_list in self.sections.items():
@@ -127,6 +132,20 @@ class SectionedHelpGroup(OrderedCommands):
 
         super().__init__(*args, commands=commands, **kwargs)
 
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [*super().list_commands(ctx), *self.lazy_commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if import_path := self.lazy_commands.get(cmd_name):
+            module_name, attr = import_path.split(":")
+            cmd = getattr(import_module(module_name), attr)
+            self.add_command(cmd, name=cmd_name)
+            self.sections.setdefault(cmd.section, []).append(cmd)
+            # NOTE: Only drop once loaded, so a failed import is raised again on the next lookup
+            del self.lazy_commands[cmd_name]
+
+        return super().get_command(ctx, cmd_name)
+
     def command(self, *args, **kwargs):
         section = kwargs.pop("section", "Commands")
         decorator = super().command(*args, **kwargs)
@@ -152,22 +171,26 @@ class SectionedHelpGroup(OrderedCommands):
         return new_decorator
 
     def format_commands(self, ctx, formatter):
-        for section, cmds in self.sections.items():
-            rows = []
-            for subcommand in self.list_commands(ctx):
-                cmd = self.get_command(ctx, subcommand)
-
-                if cmd is None or cmd.section != section:
-                    continue
-
-                rows.append((subcommand, cmd.get_short_help_str(formatter.width) or ""))
+        # NOTE: Load all commands first, since loading a lazy command may add a new section
+        commands = [
+            (subcommand, cmd)
+            for subcommand in self.list_commands(ctx)
+            if (cmd := self.get_command(ctx, subcommand)) is not None
+        ]
+
+        for section in self.sections:
+            rows = [
+                (subcommand, cmd.get_short_help_str(formatter.width) or "")
+                for subcommand, cmd in commands
+                if cmd.section == section
+            ]
 
             if rows:
                 with formatter.section(section):
                     formatter.write_dl(rows)
 
 
-def display_login_message(auth: FiefAuth, host: str):
+def display_login_message(auth: "FiefAuth", host: str):
     userinfo = auth.current_user()
     user_id = userinfo["sub"]
     username = userinfo["fields"].get("username")
@@ -181,8 +204,8 @@ def display_login_message(auth: FiefAuth, host: str):
 def profile_option(f):
     expose_value = "profile" in f.__annotations__
 
-    def get_profile(ctx: click.Context, param, value) -> BaseProfile:
-        if not (profile := settings.profile.get(value)):
+    def get_profile(ctx: click.Context, param, value) -> "BaseProfile":
+        if not (profile := get_settings().profile.get(value)):
             raise click.BadOptionUsage(option_name=param, message=f"Unknown profile '{value}'.")
 
         # Add it to context in case we need it elsewhere
@@ -195,7 +218,7 @@ def profile_option(f):
         "--profile",
         "profile",
         metavar="PROFILE",
-        default=settings.default_profile,
+        default=lambda: get_settings().default_profile,
         callback=get_profile,
         expose_value=expose_value,
         is_eager=True,  # NOTE: Required to ensure that `profile` is always set, even if not provied
@@ -210,11 +233,16 @@ def auth_required(f):
     @profile_option
     @click.pass_context
     def add_auth(ctx: click.Context, *args, **kwargs):
+        from silverback.cluster.settings import PROFILE_PATH, PlatformProfile
+
         ctx.obj = ctx.obj or {}
-        profile: BaseProfile | None = ctx.obj.get("profile")
+        profile: "BaseProfile | None" = ctx.obj.get("profile")
 
         if isinstance(profile, PlatformProfile):
-            auth_info = settings.auth[profile.auth]
+            from fief_client import Fief
+            from fief_client.integrations.cli import FiefAuth
+
+            auth_info = get_settings().auth[profile.auth]
             fief = Fief(auth_info.host, auth_info.client_id)
             ctx.obj["auth"] = FiefAuth(fief, str(PROFILE_PATH.parent / f"{profile.auth}.json"))
 
@@ -232,6 +260,8 @@ def platform_client(f):
     @auth_required
     @click.pass_context
     def get_platform_client(ctx: click.Context, *args, **kwargs):
+        from silverback.cluster.settings import PlatformProfile
+
         ctx.obj = ctx.obj or {}
         if not isinstance(profile := ctx.obj.get("profile"), PlatformProfile):
             if not expose_value:
@@ -239,8 +269,10 @@ def platform_client(f):
 
             raise click.UsageError("This command only works with the Silverback Platform")
 
+        from fief_client.integrations.cli import FiefAuthNotAuthenticatedError
+
         # NOTE: `auth` should be set if `profile` is set and is `PlatformProfile`
-        auth: FiefAuth = ctx.obj["auth"]
+        auth: "FiefAuth" = ctx.obj["auth"]
 
         try:
             display_login_message(auth, profile.host)
@@ -265,6 +297,8 @@ def platform_client(f):
 def cluster_client(f):
 
     def inject_cluster(ctx, param, value: str | None):
+        from silverback.cluster.settings import PROFILE_PATH, ClusterProfile
+
         ctx.obj = ctx.obj or {}
         if not (profile := ctx.obj.get("profile")):
             raise AssertionError("Shouldn't happen, fix cli")
@@ -313,6 +347,8 @@ def cluster_client(f):
     @platform_client
     @click.pass_context
     def get_cluster_client(ctx: click.Context, *args, **kwargs):
+        from silverback.cluster.settings import ClusterProfile, PlatformProfile
+
         ctx.obj = ctx.obj or {}
         if isinstance(profile := ctx.obj.get("profile"), ClusterProfile):
             from silverback.cluster.client import ClusterClient
@@ -341,6 +377,7 @@ def bot_path_callback(ctx: click.Context, param: click.Parameter, path: str | No
         path += ":bot"
 
     from silverback._importer import import_from_string
+    from silverback.exceptions import ImportFromStringError
 
     try:
         return import_from_string(path)
@@ -51,13 +51,15 @@ def import_from_string(import_str: Any) -> Any:
             f'Import string "{import_str}" must be in format "<module>:<attribute>".'
         )
 
-    try:
-        module = importlib.import_module(module_str)
-    except ImportError as exc:
-        if exc.name != module_str:
-            raise exc from None
-
-        raise ImportFromStringError(f'Could not import module "{module_str}".')
+    # NOTE: Skip the import machinery entirely if the module is already loaded
+    if (module := sys.modules.get(module_str)) is None:
+        try:
+            module = importlib.import_module(module_str)
+        except ImportError as exc:
+            if exc.name != module_str:
+                raise exc from None
+
+            raise ImportFromStringError(f'Could not import module "{module_str}".')
 
     instance = module
 
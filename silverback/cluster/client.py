@@ -1,7 +1,7 @@
 from collections import defaultdict
 from datetime import datetime
 from functools import cache
-from typing import ClassVar, Literal
+from typing import ClassVar, Final, Literal
 
 import httpx
 from ape import Contract
@@ -26,7 +26,7 @@ from .types import (
     WorkspaceInfo,
 )
 
-DEFAULT_HEADERS = {"User-Agent": f"Silverback SDK/{version}"}
+DEFAULT_HEADERS: Final[dict[str, str]] = {"User-Agent": f"Silverback SDK/{version}"}
 
 
 def handle_error_with_response(response: httpx.Response):
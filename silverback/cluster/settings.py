@@ -1,11 +1,12 @@
+import sys
 from pathlib import Path
+from typing import Final
 
-import tomlkit
 from pydantic import BaseModel, Field, ValidationError, model_validator
 from typing_extensions import Self
 
-PROFILE_PATH = Path.home() / ".silverback" / "profile.toml"
-DEFAULT_PROFILE = "default"
+PROFILE_PATH: Final[Path] = Path.home() / ".silverback" / "profile.toml"
+DEFAULT_PROFILE: Final[str] = "default"
 
 
 class AuthenticationConfig(BaseModel):
@@ -55,10 +56,22 @@ class ProfileSettings(BaseModel):
         settings_dict: dict  # NOTE: So mypy knows it's not redefined
 
         if PROFILE_PATH.exists():
-            # NOTE: cast to dict because tomlkit has a bug in it that mutates dicts
-            settings_dict = dict(tomlkit.loads(PROFILE_PATH.read_text()))
+            # NOTE: Only need to read, so use the faster stdlib parser when available
+            if sys.version_info >= (3, 11):
+                import tomllib
+
+                with PROFILE_PATH.open("rb") as f:
+                    settings_dict = tomllib.load(f)
+
+            else:
+                import tomlkit
+
+                # NOTE: cast to dict because tomlkit has a bug in it that mutates dicts
+                settings_dict = dict(tomlkit.loads(PROFILE_PATH.read_text()))
 
         else:  # Write the defaults to disk for next time
+            import tomlkit
+
             settings_dict = dict(
                 auth={
                     DEFAULT_PROFILE: AuthenticationConfig().model_dump(by_alias=True),
@@ -1,5 +1,6 @@
 import atexit
 import inspect
+import threading
 from collections import defaultdict
 from datetime import timedelta
 from functools import wraps
@@ -61,6 +62,9 @@ class SharedState(defaultdict):
 
             # Set state using setitem
             bot.state["something"] = ...
+
+            # Update a counter in state atomically
+            bot.state.increment("something")
     """
 
     # TODO: This class does not have thread-safe access control, but should remain safe due to
@@ -70,6 +74,7 @@ class SharedState(defaultdict):
     def __init__(self):
         # Any unknown key returns None
         super().__init__(lambda: None)
+        super().__setattr__("_lock", threading.Lock())
 
     def __getattr__(self, attr):
         try:
@@ -83,6 +88,24 @@ class SharedState(defaultdict):
         except AttributeError:
             super().__setitem__(attr, val)
 
+    def increment(self, attr: str, amount: int = 1) -> int:
+        """
+        Add ``amount`` to the value of ``attr`` (starting from 0 if unset) as a single
+        operation, so concurrent thread workers cannot lose updates like with ``+=``.
+        The value is stored in the mapping, so read it back with ``state[attr]``.
+
+        Args:
+            attr (str): The name of the value in state to update.
+            amount (int): How much to add to the value. Defaults to 1.
+
+        Returns:
+            int: The updated value.
+        """
+        with self._lock:
+            value = self[attr] = (self[attr] or 0) + amount
+
+        return value
+
 
 class SilverbackBot(ManagerAccessMixin):
     """
@@ -136,6 +159,7 @@ class SilverbackBot(ManagerAccessMixin):
             if not str(task_type).startswith("system:")
         }
         self.poll_settings: dict[str, dict] = {}
+        self.prefilters: dict[str, Callable[[Any], bool]] = {}
 
         atexit.register(provider_context.__exit__, None, None, None)
 
@@ -254,6 +278,7 @@ class SilverbackBot(ManagerAccessMixin):
         self,
         task_type: TaskType,
         container: BlockContainer | ContractEvent | None = None,
+        prefilter: Callable[[Any], bool] | None = None,
     ) -> Callable[[Callable], AsyncTaskiqDecoratedTask]:
         """
         Dynamically create a new broker task that handles tasks of ``task_type``.
@@ -266,6 +291,8 @@ class SilverbackBot(ManagerAccessMixin):
         Args:
             task_type: :class:`~silverback.types.TaskType`: The type of task to create.
             container: (BlockContainer | ContractEvent): The event source to watch.
+            prefilter: (Callable[[Any], bool] | None): Predicate the runner applies to each
+                item from ``container`` before creating a task for it.
 
         Returns:
             Callable[[Callable], :class:`~taskiq.AsyncTaskiqDecoratedTask`]:
@@ -311,6 +338,9 @@ class SilverbackBot(ManagerAccessMixin):
 
             self.tasks[task_type].append(TaskData(name=handler.__name__, labels=labels))
 
+            if prefilter is not None:
+                self.prefilters[handler.__name__] = prefilter
+
             if self.use_fork:
                 handler = self._with_fork_decorator(handler)
 
@@ -390,6 +420,7 @@ class SilverbackBot(ManagerAccessMixin):
         # TODO: possibly remove these
         new_block_timeout: int | None = None,
         start_block: int | None = None,
+        prefilter: Callable[[Any], bool] | None = None,
     ):
         """
         Create task to handle events created by the `container` trigger.
@@ -400,6 +431,11 @@ class SilverbackBot(ManagerAccessMixin):
                 Defaults to whatever the bot's settings are for default polling timeout are.
             start_block (int | None): block number to start processing events from.
                 Defaults to whatever the latest block is.
+            prefilter (Callable[[Any], bool] | None): Predicate called by the runner with each
+                new block or log. Items it returns ``False`` for are skipped and never sent
+                to the broker. If it raises, the item is also skipped and the error counts
+                towards the runner's ``max_exceptions`` like a failed task. Defaults to
+                handling every item.
 
         Raises:
             :class:`~silverback.exceptions.InvalidContainerTypeError`:
@@ -418,7 +454,9 @@ class SilverbackBot(ManagerAccessMixin):
                 else:
                     self.poll_settings["_blocks_"] = {"start_block": start_block}
 
-            return self.broker_task_decorator(TaskType.NEW_BLOCK, container=container)
+            return self.broker_task_decorator(
+                TaskType.NEW_BLOCK, container=container, prefilter=prefilter
+            )
 
         elif isinstance(container, ContractEvent) and isinstance(
             container.contract, ContractInstance
@@ -437,7 +475,9 @@ class SilverbackBot(ManagerAccessMixin):
                 else:
                     self.poll_settings[key] = {"start_block": start_block}
 
-            return self.broker_task_decorator(TaskType.EVENT_LOG, container=container)
+            return self.broker_task_decorator(
+                TaskType.EVENT_LOG, container=container, prefilter=prefilter
+            )
 
         # TODO: Support account transaction polling
         # TODO: Support mempool polling?
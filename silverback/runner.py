@@ -1,5 +1,6 @@
 import asyncio
 from abc import ABC, abstractmethod
+from typing import Any, Callable
 
 from ape import chain
 from ape.logging import logger
@@ -72,6 +73,24 @@ class BaseRunner(ABC):
         if self.exceptions > self.max_exceptions or isinstance(result.error, Halt):
             result.raise_for_error()
 
+    def _check_prefilter(self, prefilter: Callable[[Any], bool] | None, item: Any) -> bool:
+        """Whether ``item`` should be kicked to the broker, per the handler's prefilter"""
+        if prefilter is None:
+            return True
+
+        try:
+            return bool(prefilter(item))
+
+        except Exception as err:
+            # NOTE: Count the same as a failed task, so a faulty prefilter doesn't halt the runner
+            logger.error(f"Error in prefilter, skipping item: {err}")
+            self.exceptions += 1
+
+            if self.exceptions > self.max_exceptions or isinstance(err, Halt):
+                raise
+
+            return False
+
     async def _checkpoint(
         self,
         last_block_seen: int | None = None,
@@ -312,6 +331,7 @@ class WebsocketRunner(BaseRunner, ManagerAccessMixin):
 
     async def _block_task(self, task_data: TaskData):
         new_block_task_kicker = self._create_task_kicker(task_data)
+        prefilter = self.bot.prefilters.get(task_data.name)
         sub_id = await self.subscriptions.subscribe(SubscriptionType.BLOCKS)
         logger.debug(f"Handling blocks via {sub_id}")
 
@@ -319,7 +339,8 @@ class WebsocketRunner(BaseRunner, ManagerAccessMixin):
             block = self.provider.network.ecosystem.decode_block(hexbytes_dict(raw_block))
 
             await self._checkpoint(last_block_seen=block.number)
-            await self._handle_task(await new_block_task_kicker.kiq(raw_block))
+            if self._check_prefilter(prefilter, block):
+                await self._handle_task(await new_block_task_kicker.kiq(raw_block))
             await self._checkpoint(last_block_processed=block.number)
 
     async def _event_task(self, task_data: TaskData):
@@ -332,6 +353,7 @@ class WebsocketRunner(BaseRunner, ManagerAccessMixin):
         event_abi = EventABI.from_signature(event_signature)
 
         event_log_task_kicker = self._create_task_kicker(task_data)
+        prefilter = self.bot.prefilters.get(task_data.name)
 
         sub_id = await self.subscriptions.subscribe(
             SubscriptionType.EVENTS,
@@ -346,7 +368,8 @@ class WebsocketRunner(BaseRunner, ManagerAccessMixin):
             )
 
             await self._checkpoint(last_block_seen=event.block_number)
-            await self._handle_task(await event_log_task_kicker.kiq(event))
+            if self._check_prefilter(prefilter, event):
+                await self._handle_task(await event_log_task_kicker.kiq(event))
             await self._checkpoint(last_block_processed=event.block_number)
 
     async def run(self):
@@ -372,6 +395,7 @@ class PollingRunner(BaseRunner, ManagerAccessMixin):
 
     async def _block_task(self, task_data: TaskData):
         new_block_task_kicker = self._create_task_kicker(task_data)
+        prefilter = self.bot.prefilters.get(task_data.name)
 
         if block_settings := self.bot.poll_settings.get("_blocks_"):
             new_block_timeout = block_settings.get("new_block_timeout")
@@ -388,7 +412,8 @@ class PollingRunner(BaseRunner, ManagerAccessMixin):
             )
         ):
             await self._checkpoint(last_block_seen=block.number)
-            await self._handle_task(await new_block_task_kicker.kiq(block))
+            if self._check_prefilter(prefilter, block):
+                await self._handle_task(await new_block_task_kicker.kiq(block))
             await self._checkpoint(last_block_processed=block.number)
 
     async def _event_task(self, task_data: TaskData):
@@ -401,6 +426,8 @@ class PollingRunner(BaseRunner, ManagerAccessMixin):
         event_abi = EventABI.from_signature(event_signature)
 
         event_log_task_kicker = self._create_task_kicker(task_data)
+        prefilter = self.bot.prefilters.get(task_data.name)
+
         if address_settings := self.bot.poll_settings.get(contract_address):
             new_block_timeout = address_settings.get("new_block_timeout")
         else:
@@ -418,5 +445,6 @@ class PollingRunner(BaseRunner, ManagerAccessMixin):
             )
         ):
             await self._checkpoint(last_block_seen=event.block_number)
-            await self._handle_task(await event_log_task_kicker.kiq(event))
+            if self._check_prefilter(prefilter, event):
+                await self._handle_task(await event_log_task_kicker.kiq(event))
             await self._checkpoint(last_block_processed=event.block_number)
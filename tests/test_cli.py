@@ -17,3 +17,14 @@ def test_run_verbosity(cli, runner):
     """
     result = runner.invoke(cli, ["run", "--help", "--verbosity", "DEBUG"], catch_exceptions=False)
     assert result.exit_code == 0
+
+
+def test_lazy_command_import_error_is_not_swallowed(runner):
+    from silverback._click_ext import SectionedHelpGroup
+
+    group = SectionedHelpGroup(lazy_commands={"broken": "silverback.does_not_exist:cmd"})
+
+    # NOTE: A failed import must be raised again, not turn into "No such command"
+    for _ in range(2):
+        result = runner.invoke(group, ["broken"])
+        assert isinstance(result.exception, ModuleNotFoundError)
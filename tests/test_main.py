@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ape.managers.chain import BlockContainer
+from taskiq import InMemoryBroker
+
+from silverback.main import SharedState, SilverbackBot
+from silverback.types import TaskType
+
+
+@pytest.fixture
+def bot():
+    # NOTE: Skip `__init__`, which connects to a network provider
+    bot = SilverbackBot.__new__(SilverbackBot)
+    bot.broker = InMemoryBroker()
+    bot.tasks = {TaskType.NEW_BLOCK: [], TaskType.EVENT_LOG: []}
+    bot.poll_settings = {}
+    bot.prefilters = {}
+    bot.use_fork = False
+    return bot
+
+
+def test_prefilter_registered_by_handler_name(bot):
+    def only_even(block):
+        return block.number % 2 == 0
+
+    @bot.on_(BlockContainer(), prefilter=only_even)
+    def handle_block(block):
+        pass
+
+    @bot.on_(BlockContainer())
+    def handle_every_block(block):
+        pass
+
+    assert bot.prefilters == {"handle_block": only_even}
+    assert [task.name for task in bot.tasks[TaskType.NEW_BLOCK]] == [
+        "handle_block",
+        "handle_every_block",
+    ]
+
+
+def test_shared_state_increment():
+    state = SharedState()
+
+    # NOTE: Unset keys start from 0
+    assert state.increment("counter") == 1
+    assert state.increment("counter", amount=5) == 6
+    assert state["counter"] == state.counter == 6
+    assert dict(state) == {"counter": 6}
+
+
+def test_shared_state_increment_existing_item():
+    state = SharedState()
+    state["counter"] = 5
+
+    assert state.increment("counter") == 6
+    assert state["counter"] == state.counter == 6
+
+
+@pytest.mark.parametrize("key", ["values", "items", "get", "update", "increment"])
+def test_shared_state_increment_dict_method_name(key):
+    state = SharedState()
+
+    assert state.increment(key) == 1
+    assert state.increment(key, amount=2) == 3
+    assert state[key] == 3
+
+
+def test_shared_state_increment_concurrently():
+    state = SharedState()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: state.increment("counter"), range(1000)))
+
+    assert state["counter"] == state.counter == 1000
+    # NOTE: Each increment sees a distinct value, so no updates were lost
+    assert sorted(results) == list(range(1, 1001))
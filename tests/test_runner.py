@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from silverback import runner as runner_module
+from silverback.exceptions import Halt
+from silverback.main import TaskData
+from silverback.runner import PollingRunner
+
+BLOCKS = [SimpleNamespace(number=n) for n in range(4)]
+
+
+class Kicker:
+    def __init__(self):
+        self.kicked = []
+
+    async def kiq(self, item):
+        self.kicked.append(item.number)
+
+
+async def wrap_iter(iterator):
+    for item in iterator:
+        yield item
+
+
+@pytest.fixture
+def polling_runner(monkeypatch):
+    # NOTE: Iterate in the test's own loop, instead of `async_wrap_iter`'s background thread
+    monkeypatch.setattr(runner_module, "async_wrap_iter", wrap_iter)
+    monkeypatch.setattr(
+        runner_module,
+        "chain",
+        SimpleNamespace(blocks=SimpleNamespace(poll_blocks=lambda **kwargs: iter(BLOCKS))),
+    )
+    bot = SimpleNamespace(prefilters={}, poll_settings={}, new_block_timeout=None)
+    runner = PollingRunner(bot, max_exceptions=1)
+
+    runner.kicker = Kicker()
+    runner.checkpoints = []
+    runner._create_task_kicker = lambda task_data: runner.kicker
+
+    async def handle_task(task):
+        pass
+
+    async def checkpoint(**block_numbers):
+        runner.checkpoints.append(block_numbers)
+
+    runner._handle_task = handle_task
+    runner._checkpoint = checkpoint
+    return runner
+
+
+def test_prefilter_skips_kick_but_checkpoints(polling_runner):
+    polling_runner.bot.prefilters["handle_block"] = lambda block: block.number % 2 == 0
+
+    asyncio.run(polling_runner._block_task(TaskData(name="handle_block", labels={})))
+
+    assert polling_runner.kicker.kicked == [0, 2]
+    assert polling_runner.checkpoints == [
+        checkpoint
+        for block in BLOCKS
+        for checkpoint in (
+            {"last_block_seen": block.number},
+            {"last_block_processed": block.number},
+        )
+    ]
+
+
+def test_prefilter_error_counts_as_failure(polling_runner):
+    def prefilter(block):
+        if block.number in (1, 3):
+            raise ValueError("bad block")
+
+        return True
+
+    polling_runner.bot.prefilters["handle_block"] = prefilter
+
+    # NOTE: First error is skipped, second exceeds `max_exceptions=1`
+    with pytest.raises(ValueError, match="bad block"):
+        asyncio.run(polling_runner._block_task(TaskData(name="handle_block", labels={})))
+
+    assert polling_runner.kicker.kicked == [0, 2]
+    assert polling_runner.exceptions == 2
+
+
+def test_prefilter_halt_is_fatal(polling_runner):
+    def prefilter(block):
+        raise Halt()
+
+    polling_runner.bot.prefilters["handle_block"] = prefilter
+
+    with pytest.raises(Halt):
+        asyncio.run(polling_runner._block_task(TaskData(name="handle_block", labels={})))
+
+    assert polling_runner.kicker.kicked == []